@@ -0,0 +1,96 @@
+"""Cache parsed note data across invocations."""
+
+from __future__ import annotations
+
+import atexit
+import os
+import pickle  # nosec B403
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+CACHE_VERSION = 1
+
+CacheKey = Tuple[str, str]
+CacheEntry = Tuple[int, int, Any]
+
+
+class NoteCache:
+    """Parsed note data, keyed by note path and invalidated by file stats."""
+
+    def __init__(self, path: Path):
+        """Initialize cache stored at given file path."""
+        self._path = path
+        self._entries: Optional[Dict[CacheKey, CacheEntry]] = None
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        """Return filesystem path of the cache file."""
+        return self._path
+
+    @property
+    def entries(self) -> Dict[CacheKey, CacheEntry]:
+        """Return cache entries, loading them from the cache file on first use."""
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[CacheKey, CacheEntry]:
+        """Read entries from the cache file, discarding it if unusable."""
+        try:
+            with self.path.open("rb") as f:
+                data = pickle.load(f)  # nosec B301
+        except Exception:  # noqa: B902
+            # missing, corrupt or written by an incompatible version
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, path: Path, kind: str) -> Optional[Any]:
+        """Return cached data of given kind for a file, unless it has changed."""
+        entry = self.entries.get((os.path.abspath(path), kind))
+        if not isinstance(entry, tuple) or len(entry) != 3:
+            return None
+        mtime_ns, size, value = entry
+        stat = os.stat(path)
+        if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+            return None
+        return value
+
+    def put(self, path: Path, kind: str, value: Any, stat: os.stat_result) -> None:
+        """Store data of given kind for a file, with its stats from before reading."""
+        key = (os.path.abspath(path), kind)
+        self.entries[key] = (stat.st_mtime_ns, stat.st_size, value)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write cache file if there are new entries, replacing it atomically."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # unique temp file, so that concurrent processes do not clash
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f"{self.path.name}.", suffix=".tmp", dir=self.path.parent
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                data = {"version": CACHE_VERSION, "entries": self.entries}
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path)
+        except OSError:
+            # losing the cache is harmless, another process may have saved it
+            os.unlink(temp_path)
+            return
+        self._dirty = False
+
+
+@lru_cache(maxsize=None)
+def open_cache(path: Path) -> NoteCache:
+    """Open note cache at given file path, saving it when the process exits."""
+    cache = NoteCache(path)
+    atexit.register(cache.save)
+    return cache
@@ -1,16 +1,19 @@
 """A CLI tool to manage a repository of markdown files."""
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
 import typer
-from jinja2 import Environment, PackageLoader, select_autoescape
-from rich.console import Console
-from rich.syntax import Syntax
 
 from notes import config
+from notes.cache import open_cache
 from notes.models import Vault
 
+if TYPE_CHECKING:
+    from jinja2 import Template
+    from rich.console import Console
+
 app = typer.Typer(help=__doc__)
 tag = typer.Typer()
 blog = typer.Typer()
@@ -21,15 +24,43 @@ app.add_typer(
     obsidian, name="obsidian", help="Manage Obsidian.", rich_help_panel="Modules"
 )
 cfg = config.load()
-templates = Environment(
-    loader=PackageLoader(config.APP), autoescape=select_autoescape()
-)
-console = Console()
+ESCAPE_SPACE = str.maketrans({" ": "\\ "})
+
+
+@lru_cache(maxsize=None)
+def get_console() -> "Console":
+    """Create console for output on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+@lru_cache(maxsize=None)
+def get_tag_css_template() -> "Template":
+    """Load compiled stylesheet template for tags on first use."""
+    from jinja2 import (
+        Environment,
+        FileSystemBytecodeCache,
+        PackageLoader,
+        select_autoescape,
+    )
+
+    config.TEMPLATE_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    templates = Environment(
+        loader=PackageLoader(config.APP),
+        autoescape=select_autoescape(),
+        auto_reload=False,
+        cache_size=400,
+        bytecode_cache=FileSystemBytecodeCache(str(config.TEMPLATE_CACHE_PATH)),
+    )
+    return templates.get_template("tag.css")
 
 
+@lru_cache(maxsize=1)
 def get_vault() -> Vault:
     """Create new vault from config values."""
-    return Vault(cfg.vault, tags_note=cfg.tags_note)
+    cache = open_cache(config.NOTE_CACHE_PATH)
+    return Vault(cfg.vault, tags_note=cfg.tags_note, cache=cache)
 
 
 def set_vault(ctx: typer.Context, vault: Path) -> Path:
@@ -39,6 +70,7 @@ def set_vault(ctx: typer.Context, vault: Path) -> Path:
     if not vault.is_dir():
         raise typer.BadParameter(f"Vault '{vault}' does not exist.")
     cfg.vault = vault
+    get_vault.cache_clear()
     return vault
 
 
@@ -47,8 +79,8 @@ def complete_note(incomplete: str) -> Iterator[str]:
     pattern = incomplete
     if not pattern.endswith("*"):
         pattern += "*"
-    for note in get_vault().notes(Path(pattern)):
-        yield str(note.name).replace(" ", "\\ ")
+    for name in get_vault().note_paths(Path(pattern)):
+        yield name.translate(ESCAPE_SPACE)
 
 
 def validate_note(ctx: typer.Context, note: Path) -> Path:
@@ -87,8 +119,9 @@ def configure_app(
 ) -> None:
     """Update or print configuration."""
     cfg.tags_note = tags_note
+    get_vault.cache_clear()
     cfg.dump()
-    console.print_json(cfg.json())
+    get_console().print_json(cfg.json())
 
 
 @app.command("list")
@@ -96,8 +129,8 @@ def list_notes(
     pattern: Path = PatternArg,
 ) -> None:
     """List notes."""
-    for note in get_vault().notes(pattern):
-        console.print(note)
+    for name in get_vault().note_paths(pattern):
+        get_console().print(name, markup=False)
 
 
 @tag.command(name="list")
@@ -106,7 +139,7 @@ def list_tags(
 ) -> None:
     """List tags."""
     for tag in get_vault().tags(pattern):
-        console.print(tag.name)
+        get_console().print(tag.name)
 
 
 @tag.command(name="css")
@@ -117,11 +150,17 @@ def generate_tag_css(
     output: Optional[Path] = None,
 ) -> None:
     """Output stylesheet for tags."""
-    result = templates.get_template("tag.css").render(tags=get_vault().tags(pattern))
+    template = get_tag_css_template()
+    tags = get_vault().tags(pattern)
     if output:
-        output.write_text(result, encoding="utf-8")
-    elif rich:
-        console.print(Syntax(result, "css", line_numbers=True))
+        with output.open("w", encoding="utf-8") as f:
+            template.stream(tags=tags).dump(f)
+        return
+    result = template.render(tags=tags)
+    if rich:
+        from rich.syntax import Syntax
+
+        get_console().print(Syntax(result, "css", line_numbers=True))
     else:
         print(result)
 
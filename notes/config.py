@@ -2,15 +2,25 @@
 
 
 import json
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import typer
 from pydantic.dataclasses import dataclass
 from pydantic.json import pydantic_encoder
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 APP = "notes"
 CONFIG_PATH = Path(typer.get_app_dir(APP)) / "config.json"
+TEMPLATE_CACHE_PATH = Path(typer.get_app_dir(APP)) / "jinja_cache"
+NOTE_CACHE_PATH = Path(typer.get_app_dir(APP)) / "cache" / "notes.pickle"
 
 
 @dataclass
@@ -23,16 +33,36 @@ class Config:
 
     def json(self) -> str:
         """Return config as JSON string."""
-        return json.dumps(self, indent=4, default=pydantic_encoder)
+        if orjson is None:  # pragma: no cover
+            return json.dumps(self, indent=2, default=pydantic_encoder)
+        option = orjson.OPT_INDENT_2
+        return orjson.dumps(self, option=option, default=pydantic_encoder).decode()
 
     def dump(self) -> None:
-        """Write config to config file."""
+        """Write config to config file, replacing it atomically."""
         CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        CONFIG_PATH.write_text(self.json(), encoding="utf-8")
+        # unique temp file, so that concurrent processes do not clash
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f"{CONFIG_PATH.name}.", suffix=".tmp", dir=CONFIG_PATH.parent
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.json())
+            os.replace(temp_path, CONFIG_PATH)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        _read.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _read() -> Dict[str, Any]:
+    """Read config values from config file once."""
+    if not CONFIG_PATH.is_file():
+        return {}
+    return dict(json.loads(CONFIG_PATH.read_bytes()))
 
 
 def load() -> Config:
     """Load config from config file."""
-    if not CONFIG_PATH.is_file():
-        return Config()
-    return Config(**dict(json.loads(CONFIG_PATH.read_text(encoding="utf-8"))))
+    return Config(**_read())
@@ -2,35 +2,169 @@
 
 from __future__ import annotations
 
+import os
 import re
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date
 from enum import Enum
-from functools import cached_property
-from itertools import chain
+from functools import cached_property, lru_cache
+from itertools import takewhile
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
-
-import yaml
-from markdown_it import MarkdownIt
-from mdit_py_plugins.front_matter.index import front_matter_plugin
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from markdown_it import MarkdownIt
+
+    from notes.cache import NoteCache
 
 Table = List[Dict[str, str]]
+T = TypeVar("T")
+FRONTMATTER_OPEN_RE = re.compile(r"-{3,}")
+FRONTMATTER_CLOSE_RE = re.compile(r" {0,3}(-{3,})[ \t]*")
+FRONTMATTER_END = "..."
+PREFETCH_MIN_NOTES = 8
+GLOB_CHARS = frozenset("*?[")
+# glob matches case-insensitively on Windows
+PATTERN_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+MATCH_ALL_PATTERNS = (Path("*"), Path("**/*"), Path("."))
+TEMPLATE_VALUE_RE = re.compile(r"({{.*?}})")
+
+
+@lru_cache(maxsize=None)
+def _markdown_parser() -> MarkdownIt:
+    """Create markdown parser once, registering plugins on first use."""
+    from markdown_it import MarkdownIt
+    from mdit_py_plugins.front_matter.index import front_matter_plugin
+
+    return MarkdownIt().use(front_matter_plugin).enable("table")
+
+
+def _is_literal(pattern: Union[str, Path]) -> bool:
+    """Return whether pattern has no glob characters."""
+    return GLOB_CHARS.isdisjoint(str(pattern))
+
+
+def _translate(segment: str) -> str:
+    """Translate glob pattern segment to regex, never matching across folders."""
+    i, n = 0, len(segment)
+    result = []
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            result.append("[^/]*")
+        elif c == "?":
+            result.append("[^/]")
+        elif c == "[":
+            j = i + 1 if segment[i : i + 1] == "!" else i
+            j = segment.find("]", j + 1 if segment[j : j + 1] == "]" else j)
+            if j < 0:
+                result.append(re.escape(c))
+                continue
+            result.append(_translate_set(segment[i:j]))
+            i = j + 1
+        else:
+            result.append(re.escape(c))
+    return "".join(result)
+
+
+def _translate_set(chars: str) -> str:
+    """Translate glob character set to regex, dropping invalid ranges like fnmatch."""
+    if "-" not in chars:
+        chars = chars.replace("\\", "\\\\")
+    else:
+        chunks = []
+        i = 0
+        k = 2 if chars.startswith("!") else 1
+        while True:
+            k = chars.find("-", k)
+            if k < 0:
+                break
+            chunks.append(chars[i:k])
+            i = k + 1
+            k = k + 3
+        if chars[i:]:
+            chunks.append(chars[i:])
+        else:
+            chunks[-1] += "-"
+        # remove empty ranges, invalid in regex
+        for k in range(len(chunks) - 1, 0, -1):
+            if chunks[k - 1][-1] > chunks[k][0]:
+                chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+                del chunks[k]
+        # escape hyphens not forming ranges
+        chars = "-".join(x.replace("\\", "\\\\").replace("-", "\\-") for x in chunks)
+    # escape set operations and nested sets
+    chars = re.sub(r"([&~|\[])", r"\\\1", chars)
+    if not chars:
+        return "(?!)"
+    if chars == "!":
+        return "[^/]"
+    if chars[0] == "!":
+        chars = "^" + chars[1:]
+    elif chars[0] == "^":
+        chars = "\\" + chars
+    return f"[{chars}]"
+
+
+def _translate_parts(parts: Sequence[str]) -> str:
+    """Translate glob pattern to regex prefix, each folder ending with a slash."""
+    return "".join("(?:[^/]+/)*" if x == "**" else _translate(x) + "/" for x in parts)
+
+
+@lru_cache(maxsize=None)
+def _compile_pattern(
+    pattern: Path,
+) -> Tuple[Tuple[str, ...], re.Pattern[str], List[re.Pattern[str]]]:
+    """Split pattern into literal folders, note regex and folder regexes."""
+    parts = pattern.parts
+    file_parts = pattern.with_suffix(".md").parts
+    literals = parts if _is_literal(pattern) else parts[:-1]
+    regex = re.compile(
+        rf"{_translate_parts(parts)}(?P<nested>.*\.md)"
+        rf"|{_translate_parts(file_parts)[:-1]}",
+        PATTERN_FLAGS,
+    )
+    segments = [
+        re.compile(_translate(x), PATTERN_FLAGS) for x in takewhile("**".__ne__, parts)
+    ]
+    return tuple(takewhile(_is_literal, literals)), regex, segments
 
 
-@dataclass
 class Block:
     """Single token block in note."""
 
-    kind: str
-    content: str = ""
-    children: list[Block] = field(default_factory=list)
+    __slots__ = ("kind", "content", "children", "_inline")
+
+    def __init__(
+        self, kind: str, content: str = "", children: Optional[List[Block]] = None
+    ):
+        """Initialize block with its contents and child blocks."""
+        self.kind = kind
+        self.content = content
+        self.children = children if children is not None else []
+        self._inline: Optional[str] = None
 
     @staticmethod
     def parse_file(path: Path) -> Block:
         """Parse blocks from markdown file."""
         content = path.read_text(encoding="utf-8")
-        tokens = MarkdownIt().use(front_matter_plugin).enable("table").parse(content)
+        tokens = _markdown_parser().parse(content)
         stack = [Block("root")]
         for token in tokens:
             if token.type.endswith("_open"):
@@ -48,7 +182,15 @@ class Block:
 
     def inline(self) -> str:
         """Recursive contents of block."""
-        return self.content + "".join(x.inline() for x in self.children)
+        if self._inline is None:
+            result = []
+            stack = [self]
+            while stack:
+                block = stack.pop()
+                result.append(block.content)
+                stack.extend(reversed(block.children))
+            self._inline = "".join(result)
+        return self._inline
 
     def each(self, kind: str) -> Iterator[Block]:
         """Yield all children with given kind."""
@@ -63,6 +205,10 @@ class Block:
         except StopIteration:
             return Block(kind)
 
+    def __repr__(self) -> str:
+        """Block object repr."""
+        return f'Block("{self.kind}", {len(self.children)} children)'
+
 
 class State(Enum):
     """State of a note."""
@@ -77,8 +223,19 @@ class State(Enum):
 class Tag:
     """A tag on a note."""
 
+    __slots__ = ("name", "group")
+
     name: str
-    group: str = field(repr=False)
+    group: str
+
+    def __getstate__(self) -> Tuple[str, str]:
+        """Return fields for pickling, since slots have no instance dict."""
+        return self.name, self.group
+
+    def __setstate__(self, state: Tuple[str, str]) -> None:
+        """Restore fields from pickled state, bypassing frozen assignment."""
+        object.__setattr__(self, "name", state[0])
+        object.__setattr__(self, "group", state[1])
 
 
 class Note:
@@ -88,6 +245,9 @@ class Note:
         """Initialize note from file path."""
         self._vault = note_vault
         self._path = path
+        self._frontmatter: Optional[str] = None
+        # file stats taken before reading, for each kind of parsed data
+        self._read_stats: Dict[str, os.stat_result] = {}
 
     @property
     def vault(self) -> Vault:
@@ -107,15 +267,67 @@ class Note:
     @cached_property
     def root(self) -> Block:
         """Return commonmark ast node for the whole node."""
+        self._read_stats["tables"] = os.stat(self.path)
         return Block.parse_file(self.path)
 
+    def _read_frontmatter(self) -> str:
+        """Read raw frontmatter from the top of the note, skipping the rest."""
+        if self._frontmatter is None:
+            self._frontmatter = ""
+            self._read_stats["meta"] = os.stat(self.path)
+            with self.path.open(encoding="utf-8") as f:
+                opening = FRONTMATTER_OPEN_RE.match(f.readline())
+                if opening:
+                    self._frontmatter = self._scan_frontmatter(f, len(opening[0]))
+        return self._frontmatter
+
+    @staticmethod
+    def _scan_frontmatter(lines: Iterable[str], marker_length: int) -> str:
+        """Collect frontmatter lines until closing marker, same as markdown-it."""
+        matter: List[str] = []
+        iterator = iter(lines)
+        for line in iterator:
+            closing = FRONTMATTER_CLOSE_RE.fullmatch(line.rstrip("\n"))
+            if closing and len(closing[1]) >= marker_length:
+                return "".join(matter)
+            matter.append(line)
+            if line.rstrip("\n").lstrip(" \t") == FRONTMATTER_END:
+                # end line is part of frontmatter, unless it ends the note
+                return "".join(matter) if next(iterator, None) is not None else ""
+        # unclosed frontmatter is not frontmatter
+        return ""
+
+    def _cached(self, kind: str, parse: Callable[[], T]) -> T:
+        """Return parsed data from the vault cache, parsing it on a miss."""
+        cache = self.vault.cache
+        if cache is None:
+            return parse()
+        value: Optional[T] = cache.get(self.path, kind)
+        if value is None:
+            value = parse()
+            cache.put(self.path, kind, value, self._read_stats[kind])
+        return value
+
     @cached_property
     def meta(self) -> Dict[str, Any]:
         """Return YAML frontmatter data."""
-        matter = self.root.only("front_matter").inline()
+        return self._cached("meta", self._parse_meta)
+
+    def _parse_meta(self) -> Dict[str, Any]:
+        """Parse YAML frontmatter data."""
+        import yaml
+
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:  # pragma: no cover
+            from yaml import SafeLoader  # type: ignore[no-redef]
+
+        matter = self._read_frontmatter()
+        if not matter.strip():
+            return {}
         # wrap template values in string
-        matter = re.sub(r"({{.*?}})", r'"\g<1>"', matter)
-        return yaml.safe_load(matter) or {}
+        matter = TEMPLATE_VALUE_RE.sub(r'"\g<1>"', matter)
+        return yaml.load(matter, Loader=SafeLoader) or {}
 
     @property
     def state(self) -> State:
@@ -152,12 +364,18 @@ class Note:
         meta_tags = self.meta.get("tags")
         if not isinstance(meta_tags, list):
             return []
-        tag_names = {f"#{x}" for x in meta_tags}
-        return [tag for tag in self.vault.all_tags if tag.name in tag_names]
+        known_names = self.vault._tag_names
+        records = self.vault._tag_records
+        tag_names = dict.fromkeys(f"#{x}" for x in meta_tags)
+        return [records[x] for x in tag_names if x in known_names]
 
     @cached_property
     def tables(self) -> List[Table]:
         """Return the tables in the note."""
+        return self._cached("tables", self._parse_tables)
+
+    def _parse_tables(self) -> List[Table]:
+        """Parse the tables in the note."""
         tables = []
         for table in self.root.each("table"):
             headers = [th.inline() for th in table.only("thead").only("tr").each("th")]
@@ -182,9 +400,16 @@ class Note:
 class Vault:
     """A note vault containing all the notes."""
 
-    def __init__(self, path: Path, *, tags_note: Optional[Path]):
-        """Initialize vault with optional meta data."""
+    def __init__(
+        self,
+        path: Path,
+        *,
+        tags_note: Optional[Path],
+        cache: Optional[NoteCache] = None,
+    ):
+        """Initialize vault with optional meta data and parsed note cache."""
         self._path = path
+        self._cache = cache
         self._tags_note = self.note(tags_note) if tags_note else None
 
     @property
@@ -192,14 +417,45 @@ class Vault:
         """Return filesystem path of vault."""
         return self._path
 
+    @property
+    def cache(self) -> Optional[NoteCache]:
+        """Return cache of parsed note data, if any."""
+        return self._cache
+
     def notes(self, pattern: Path) -> Iterator[Note]:
         """Return all notes in vault."""
-        queries = [
-            (pattern / "**" / "*").with_suffix(".md"),
-            pattern.with_suffix(".md"),
-        ]
-        for x in chain(*(sorted(self.path.glob(str(q))) for q in queries)):
-            yield Note(self, x)
+        for name in self.note_paths(pattern):
+            yield Note(self, self.path / f"{name}.md")
+
+    def note_paths(self, pattern: Path) -> Iterator[str]:
+        """Return names of all notes in vault, without creating notes."""
+        literals, regex, segments = _compile_pattern(pattern)
+        # notes under matching folders are listed before matching files
+        matches: List[Tuple[int, Tuple[str, ...]]] = []
+        if _is_literal(pattern):
+            note_parts = pattern.with_suffix(".md").parts
+            if self.path.joinpath(*note_parts).is_file():
+                matches.append((1, note_parts))
+        top = self.path.joinpath(*literals)
+        walk = os.walk(top, followlinks=True) if top.is_dir() else iter([])
+        for folder, subfolders, files in walk:
+            relative = Path(folder).relative_to(self.path).parts
+            depth = len(relative)
+            if depth < len(segments):
+                subfolders[:] = [x for x in subfolders if segments[depth].fullmatch(x)]
+            else:
+                # like glob, follow symlinks only for explicit pattern folders
+                subfolders[:] = [
+                    x for x in subfolders if not os.path.islink(os.path.join(folder, x))
+                ]
+            prefix = "".join(f"{x}/" for x in relative)
+            for name in files:
+                match = regex.fullmatch(prefix + name)
+                if match:
+                    nested = match.group("nested") is not None
+                    matches.append((0 if nested else 1, (*relative, name)))
+        for _, parts in sorted(matches):
+            yield os.path.join(*parts)[: -len(".md")]
 
     def note(self, name: Path) -> Note:
         """Return the note with given note name."""
@@ -207,25 +463,60 @@ class Vault:
 
     def tags(self, pattern: Path) -> List[Tag]:
         """Return all tags in the vault using the meta tags note."""
-        if pattern == Path("*") and self.all_tags:
+        if pattern in MATCH_ALL_PATTERNS:
+            # notes can only have tags from the tags note
             return self.all_tags
-        notes = self.notes(pattern)
-        return sorted(set(chain(*(note.tags for note in notes))))
+        if not self._tag_names:
+            return []
+        if _is_literal(pattern) and not (self.path / pattern).is_dir():
+            note = self.note(pattern)
+            return sorted(set(note.tags)) if note.path.is_file() else []
+        notes = list(self.notes(pattern))
+        self._prefetch_frontmatter(notes)
+        found: Dict[Tag, None] = {}
+        for note in notes:
+            found.update(dict.fromkeys(note.tags))
+            if len(found) == len(self._tag_names):
+                # notes can only have tags from the tags note
+                break
+        return sorted(found)
+
+    def _prefetch_frontmatter(self, notes: List[Note]) -> None:
+        """Read frontmatter of many notes concurrently, ahead of parsing."""
+        cache = self.cache
+        if cache:
+            notes = [x for x in notes if cache.get(x.path, "meta") is None]
+        if len(notes) < PREFETCH_MIN_NOTES:
+            return
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(Note._read_frontmatter, notes):
+                pass
 
-    @cached_property
+    @property
     def all_tags(self) -> List[Tag]:
         """All tags from the tags note."""
+        return list(self._tag_records.values())
+
+    @cached_property
+    def _tag_records(self) -> Dict[str, Tag]:
+        """Tags from the tags note, indexed by name in order."""
         if not self._tags_note:
-            return []
-        tags = []
+            return {}
+        records: Dict[str, Tag] = {}
         groups = [x["group"] for x in self._tags_note.tables[0]]
         meta_tags = [x["tag"] for x in self._tags_note.tables[1]]
         group = "unknown"
         for meta_tag in meta_tags:
             if meta_tag in groups:
                 group = meta_tag.lstrip("#")
-            tags.append(Tag(meta_tag, group))
-        return tags
+            records.setdefault(meta_tag, Tag(meta_tag, group))
+        return records
+
+    @cached_property
+    def _tag_names(self) -> FrozenSet[str]:
+        """Names of tags from the tags note."""
+        return frozenset(self._tag_records)
 
     def __repr__(self) -> str:
         """Vault object repr."""
@@ -1,15 +1,19 @@
 """Unittests for the CLI."""
 
 
+import copy
 import importlib
 import json
+import pickle
 from pathlib import Path
 
 import pytest
 from typer.testing import CliRunner
 
 from notes import cli, config
+from notes.cache import NoteCache, open_cache
 from notes.config import Config
+from notes.models import Tag, Vault
 
 runner = CliRunner()
 
@@ -66,6 +70,8 @@ def vault(tmp_path: Path) -> Path:
 def cfg(vault: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Config:
     """Fixture for prefs."""
     monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.json")
+    monkeypatch.setattr(config, "TEMPLATE_CACHE_PATH", tmp_path / "jinja_cache")
+    monkeypatch.setattr(config, "NOTE_CACHE_PATH", tmp_path / "cache" / "notes")
     cfg = Config()
     cfg.vault = vault
     cfg.dump()
@@ -101,6 +107,14 @@ def test_config_set_vault(vault: Path) -> None:
     assert result.exit_code == 0
     cfg = config.load()
     assert cfg.vault == vault
+    assert not list(config.CONFIG_PATH.parent.glob("*.tmp"))
+
+
+def test_config_load_returns_copy(vault: Path) -> None:
+    """Test that unsaved changes to a loaded config are not shared."""
+    cfg = config.load()
+    cfg.vault = vault / "unsaved"
+    assert config.load().vault == vault
 
 
 def test_config_vault_missing() -> None:
@@ -147,6 +161,37 @@ def test_note_list_with_folder_pattern() -> None:
     ]
 
 
+def test_note_list_with_nested_pattern() -> None:
+    """Test listing notes matching a pattern inside a folder."""
+    result = runner.invoke(cli.app, "list meta/T*")
+    assert result.exit_code == 0
+    assert result.stdout.strip().split("\n") == [
+        str(Path("meta/Tags")),
+    ]
+
+
+def test_note_list_with_symlinked_folder(vault: Path, tmp_path: Path) -> None:
+    """Test listing notes in symlinked folders matched by pattern."""
+    (tmp_path / "linked").mkdir()
+    (tmp_path / "linked" / "Linked.md").write_text("Note outside the vault.")
+    try:
+        (vault / "link").symlink_to(tmp_path / "linked", target_is_directory=True)
+    except OSError:
+        pytest.skip("symlinks are not supported")
+    result = runner.invoke(cli.app, "list l*")
+    assert result.exit_code == 0
+    assert result.stdout.strip().split("\n") == [
+        str(Path("link/Linked")),
+    ]
+
+
+def test_note_list_with_reversed_range_pattern() -> None:
+    """Test that a glob character set with a reversed range matches nothing."""
+    result = runner.invoke(cli.app, "list [a-N]*")
+    assert result.exit_code == 0
+    assert result.stdout == ""
+
+
 def test_note_list_with_missing_pattern() -> None:
     """Test listing notes in vault."""
     result = runner.invoke(cli.app, "list nada")
@@ -154,6 +199,12 @@ def test_note_list_with_missing_pattern() -> None:
     assert result.stdout == ""
 
 
+def test_note_completion(vault: Path) -> None:
+    """Test completing note names with escaped spaces."""
+    (vault / "Note 3.md").write_text("Note with space in name.")
+    assert list(cli.complete_note("Note")) == ["Note\\ 3", "Note1", "Note2"]
+
+
 def test_tag_list() -> None:
     """Test listing tags in vault."""
     result = runner.invoke(cli.app, "tag list")
@@ -168,6 +219,80 @@ def test_tag_list_with_pattern() -> None:
     assert result.stdout.strip().split("\n") == ["#def"]
 
 
+def test_tag_list_with_unclosed_frontmatter(vault: Path) -> None:
+    """Test that a note starting with a thematic break has no frontmatter."""
+    (vault / "Rule.md").write_text(
+        "\n".join(
+            [
+                "---",
+                "",
+                "# Heading",
+                "",
+                "Some prose: with a colon. And: another one",
+                "- item",
+            ]
+        )
+    )
+    result = runner.invoke(cli.app, " tag list Rule")
+    assert result.exit_code == 0
+    assert result.stdout == ""
+
+
+def test_tag_list_with_note_name() -> None:
+    """Test listing tags of a single note."""
+    result = runner.invoke(cli.app, " tag list Note2")
+    assert result.exit_code == 0
+    assert result.stdout.strip().split("\n") == ["#def"]
+
+
+@pytest.mark.parametrize("count", [10, 70])
+def test_tag_list_with_many_notes(vault: Path, count: int) -> None:
+    """Test listing tags across enough notes to read them concurrently."""
+    (vault / "many").mkdir()
+    for i in range(count):
+        tag = "abc" if i % 2 else "def"
+        (vault / "many" / f"Note{i}.md").write_text(f"---\ntags: [{tag}]\n---\n")
+    result = runner.invoke(cli.app, " tag list many")
+    assert result.exit_code == 0
+    assert result.stdout.strip().split("\n") == ["#abc", "#def"]
+
+
+def test_tag_list_with_note_cache(vault: Path, tmp_path: Path) -> None:
+    """Test reusing parsed notes from cache until they change."""
+    result = runner.invoke(cli.app, " tag list Note*")
+    assert result.exit_code == 0
+    assert result.stdout.strip().split("\n") == ["#def"]
+    cache = open_cache(tmp_path / "cache" / "notes")
+    cache.save()
+    assert cache.path.is_file()
+    assert not list(cache.path.parent.glob("*.tmp"))
+    (vault / "Note2.md").write_text("---\ntags: [abc, def]\n---\n")
+    result = runner.invoke(cli.app, " tag list Note*")
+    assert result.exit_code == 0
+    assert result.stdout.strip().split("\n") == ["#abc", "#def"]
+
+
+def test_note_cache_with_note_changed_after_read(vault: Path, tmp_path: Path) -> None:
+    """Test that a note changed after reading is not cached as unchanged."""
+    cache = NoteCache(tmp_path / "notes-cache")
+    note = Vault(vault, tags_note=None, cache=cache).note(Path("Note2"))
+    note._read_frontmatter()
+    note.path.write_text("---\ntags: [abc, def]\n---\n")
+    assert note.meta["tags"] == ["def"]
+    note = Vault(vault, tags_note=None, cache=cache).note(Path("Note2"))
+    assert note.meta["tags"] == ["abc", "def"]
+
+
+@pytest.mark.parametrize("content", [b"", b"corrupt", b"\x80\x04K\x01."])
+def test_tag_list_with_unusable_note_cache(tmp_path: Path, content: bytes) -> None:
+    """Test ignoring a corrupt or incompatible note cache."""
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "cache" / "notes").write_bytes(content)
+    result = runner.invoke(cli.app, " tag list Note*")
+    assert result.exit_code == 0
+    assert result.stdout.strip().split("\n") == ["#def"]
+
+
 def test_tag_list_with_missing_pattern() -> None:
     """Test listing tags in vault."""
     result = runner.invoke(cli.app, " tag list nada")
@@ -175,6 +300,14 @@ def test_tag_list_with_missing_pattern() -> None:
     assert result.stdout == ""
 
 
+def test_tag_copy_and_pickle() -> None:
+    """Test that slotted frozen tags survive copying and pickling."""
+    tag = Tag("#abc", "abc")
+    assert pickle.loads(pickle.dumps(tag)) == tag
+    assert copy.copy(tag) == tag
+    assert copy.deepcopy(tag) == tag
+
+
 def test_tag_css() -> None:
     """Test listing tags in vault."""
     result = runner.invoke(cli.app, "tag css --no-rich")
@@ -183,3 +316,21 @@ def test_tag_css() -> None:
         '.tag[href$="/tags/def/"], .tag[href="#def"] '
         "{ --tag-group: var(--tag-group-abc); }"
     ) in result.stdout
+
+
+def test_tag_css_output(tmp_path: Path) -> None:
+    """Test writing stylesheet for tags to a file."""
+    output = tmp_path / "tag.css"
+    result = runner.invoke(cli.app, f"tag css --output '{output}'")
+    assert result.exit_code == 0
+    assert (
+        '.tag[href$="/tags/def/"], .tag[href="#def"] '
+        "{ --tag-group: var(--tag-group-abc); }"
+    ) in output.read_text(encoding="utf-8")
+
+
+def test_template_bytecode_cache(tmp_path: Path) -> None:
+    """Test caching compiled templates on disk."""
+    result = runner.invoke(cli.app, "tag css --no-rich")
+    assert result.exit_code == 0
+    assert list((tmp_path / "jinja_cache").iterdir())